@@ -1,5 +1,6 @@
 from celery import Celery
 import os
+import redis
 
 redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
@@ -16,3 +17,12 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
 )
+
+_redis = None
+
+def get_redis() -> redis.Redis:
+    # Shared job-status client (the "jobs" hash), created on first use
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(redis_url)
+    return _redis
@@ -1,38 +1,89 @@
-from fastapi import FastAPI, UploadFile, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, UploadFile, Request, Form
+from fastapi.responses import JSONResponse, Response
 from uuid import uuid4
-from .celery_app import celery_app
+from .celery_app import celery_app, get_redis
 from starlette.websockets import WebSocket
 from fastapi.staticfiles import StaticFiles
 import os
-import redis
 import asyncio
 import json
 
+# The API only queues jobs and reports status: it must not import the
+# tracing/font services (cv2, numpy, fontTools) at load time. Those load
+# in the worker; routes that need one import it on first use.
+
 app = FastAPI()
 
 # Ensure generated directory exists
 os.makedirs("backend/app/generated", exist_ok=True)
 app.mount("/download", StaticFiles(directory="backend/app/generated"), name="download")
 
-# Redis client
-redis_client = redis.Redis(host="redis", port=6379, db=0)
-
 @app.get("/template")
-def get_template():
-    # returns printable PNG/PDF grid
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(base_dir, "assets", "template.pdf")
-    if not os.path.exists(template_path):
-        return {"error": "Template not found"}
-    return FileResponse(template_path)
+def get_template(request: Request, charset: str = None, cols: int = None,
+                 cell_width: float = None, cell_height: float = None,
+                 paper: str = "letter", dpi: int = 300):
+    # Printable PDF grid, rendered on demand and memoized per parameter set
+    from .services import template
+
+    try:
+        pdf, etag = template.get_template(
+            charset or template.DEFAULT_CHARSET,
+            cols or template.DEFAULT_COLS,
+            cell_width or template.DEFAULT_CELL_WIDTH,
+            cell_height or template.DEFAULT_CELL_HEIGHT,
+            paper,
+            dpi,
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=86400",
+        "Content-Disposition": 'inline; filename="template.pdf"',
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(pdf, media_type="application/pdf", headers=headers)
+
+@app.get("/preview/{job_id}")
+def get_preview(job_id: str, request: Request, text: str = None, fmt: str = "png", size: int = 64):
+    # Specimen render of a finished font, so users can check it without installing
+    from .services import preview
+
+    try:
+        content, media_type, etag = preview.get_preview(job_id, text or preview.DEFAULT_TEXT, fmt, size)
+    except preview.PreviewNotFound:
+        return JSONResponse({"error": "Font not found"}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
 
 @app.post("/upload")
-async def upload(sample: UploadFile):
+async def upload(sample: UploadFile, charset: str = Form(None), cols: int = Form(None),
+                 cell_width: float = Form(None), cell_height: float = Form(None)):
+    # charset/cols/cell size describe a custom template (same parameters as
+    # /template); omit them for the default one
+    from .services.layout import (DEFAULT_CELL_HEIGHT, DEFAULT_CELL_WIDTH, DEFAULT_CHARSET,
+                                  DEFAULT_COLS, validate_layout)
+
+    charset = charset or DEFAULT_CHARSET
+    cols = cols or DEFAULT_COLS
+    cell_width = cell_width or DEFAULT_CELL_WIDTH
+    cell_height = cell_height or DEFAULT_CELL_HEIGHT
+    try:
+        validate_layout(charset, cols, cell_width, cell_height)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
     job_id = str(uuid4())
     # Read file content
     content = await sample.read()
-    celery_app.send_task("tasks.build_font", args=[job_id, content])
+    celery_app.send_task("tasks.build_font", args=[job_id, content, charset, cols, cell_width, cell_height])
     return {"job_id": job_id}
 
 @app.websocket("/ws/{job_id}")
@@ -40,12 +91,12 @@ async def ws_status(ws: WebSocket, job_id: str):
     await ws.accept()
     try:
         while True:
-            data = redis_client.hget("jobs", job_id)  # Returns bytes
+            data = get_redis().hget("jobs", job_id)  # Returns bytes
             if data:
                 # Decode bytes to string, then parse JSON
                 status = json.loads(data.decode('utf-8'))
                 await ws.send_json(status)
-                if status.get("state") == "DONE":
+                if status.get("state") in ("DONE", "FAILED"):
                     break
             else:
                 # Job not found yet, send waiting status
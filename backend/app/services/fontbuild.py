@@ -1,5 +1,7 @@
+from fontTools.agl import UV2AGL
 from fontTools.fontBuilder import FontBuilder
 from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.transformPen import TransformPen
 from fontTools.svgLib.path import parse_path
 import os
 
@@ -13,6 +15,26 @@ def make_font(svg_map: dict, job_id: str) -> str:
     out_filename = f"{job_id}.otf"
     out_path = os.path.join(out_dir, out_filename)
     
+    fb = assemble_font(svg_map, job_id)
+    
+    # Save
+    fb.save(out_path)
+    
+    # Return URL path (relative to API root)
+    return f"/download/{out_filename}"
+
+def glyph_name(char: str) -> str:
+    # Letters and digits name themselves (as before); punctuation from
+    # custom template charsets gets its standard (AGL) or uniXXXX name
+    if char.isascii() and char.isalnum():
+        return char
+    return UV2AGL.get(ord(char), f"uni{ord(char):04X}")
+
+def assemble_font(svg_map: dict, job_id: str) -> FontBuilder:
+    """
+    Build the CFF font in memory from a char -> SVG path map.
+    The caller decides where (or whether) to save it.
+    """
     # Setup FontBuilder
     units_per_em = 1000
     fb = FontBuilder(units_per_em, isTTF=False)
@@ -21,11 +43,12 @@ def make_font(svg_map: dict, job_id: str) -> str:
     # .notdef is required
     # Sort keys for stability
     chars = sorted(svg_map.keys())
-    glyph_order = ['.notdef'] + chars
+    names = {c: glyph_name(c) for c in chars}
+    glyph_order = ['.notdef'] + [names[c] for c in chars]
     fb.setupGlyphOrder(glyph_order)
     
     # Map chars to unicode
-    cmap = {ord(c): c for c in chars}
+    cmap = {ord(c): names[c] for c in chars}
     fb.setupCharacterMap(cmap)
     
     # Create glyphs
@@ -53,8 +76,6 @@ def make_font(svg_map: dict, job_id: str) -> str:
             # We also need to scale/translate to fit the em square
             
             # We'll use a transform pen to do the flipping/scaling
-            from fontTools.pens.transformPen import TransformPen
-            
             # Calculate bounds if possible, or just use fixed scale
             # Let's try a fixed scale for now, assuming the input is reasonable
             # Flip Y: (1, 0, 0, -1, 0, 0)
@@ -71,9 +92,9 @@ def make_font(svg_map: dict, job_id: str) -> str:
         except Exception as e:
             print(f"Error tracing {char}: {e}")
             
-        charStrings[char] = pen.getCharString()
+        charStrings[names[char]] = pen.getCharString()
         # Fixed width for now
-        metrics[char] = (600, 0)
+        metrics[names[char]] = (600, 0)
         
     # Name table - remove uniqueID as it's not a standard field
     name_strings = dict(
@@ -102,8 +123,4 @@ def make_font(svg_map: dict, job_id: str) -> str:
     # Post table
     fb.setupPost()
     
-    # Save
-    fb.save(out_path)
-    
-    # Return URL path (relative to API root)
-    return f"/download/{out_filename}"
+    return fb
@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# "npy": memory-mapped .npy files in the job's working directory
+# "shm": POSIX shared memory segments (RAM only, never touches disk)
+DEFAULT_BACKEND = os.getenv("IMAGE_STORE_BACKEND", "npy")
+
+MANIFEST = "segments.json"
+
+def job_dir(job_id: str) -> str:
+    # Per-job working directory, removed by release_job()
+    return os.path.join(tempfile.gettempdir(), "handwriting-font", job_id)
+
+class JobImageStore:
+    """
+    Zero-copy image transport between pipeline stages of one job.
+
+    put() copies an array into a shared buffer once and returns a small
+    JSON-serializable handle; any process on the same host can attach()
+    to that handle instead of receiving a pickled copy. Everything the
+    store created is released when the job finishes (or the with-block exits).
+    """
+
+    def __init__(self, job_id: str, backend: str = None):
+        if backend is None:
+            backend = DEFAULT_BACKEND
+        if backend not in ("npy", "shm"):
+            raise ValueError(f"Unknown image store backend: {backend}")
+        self.job_id = job_id
+        self.backend = backend
+        self.dir = job_dir(job_id)
+        os.makedirs(self.dir, exist_ok=True)
+        # Keep our own segments mapped for as long as the store is open
+        self._segments = {}
+
+    def put(self, name: str, array: np.ndarray) -> dict:
+        handle = {
+            "backend": self.backend,
+            "shape": list(array.shape),
+            "dtype": array.dtype.str,
+        }
+        if self.backend == "npy":
+            path = os.path.join(self.dir, f"{name}.npy")
+            out = np.lib.format.open_memmap(path, mode="w+", dtype=array.dtype, shape=array.shape)
+            out[...] = array
+            out.flush()
+            del out
+            handle["path"] = path
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1), name=f"hwf_{uuid.uuid4().hex[:16]}")
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            self._segments[name] = shm
+            self._write_manifest()
+            handle["name"] = shm.name
+        return handle
+
+    def _write_manifest(self):
+        # Lets release_job() find our segments from any process
+        names = [shm.name for shm in self._segments.values()]
+        with open(os.path.join(self.dir, MANIFEST), "w") as f:
+            json.dump(names, f)
+
+    def close(self):
+        for shm in self._segments.values():
+            shm.close()
+        self._segments = {}
+        release_job(self.job_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@contextmanager
+def attach(handle: dict):
+    """
+    Map the buffer behind a handle as a read-only array, without copying.
+    The array must not be used after the with-block exits.
+    """
+    shape = tuple(handle["shape"])
+    dtype = np.dtype(handle["dtype"])
+    if handle["backend"] == "npy":
+        array = np.load(handle["path"], mmap_mode="r")
+        try:
+            yield array
+        finally:
+            del array
+        return
+
+    shm = shared_memory.SharedMemory(name=handle["name"])
+    # Attaching registers the segment with this process's resource tracker,
+    # which would unlink it when we exit; ownership stays with the store
+    resource_tracker.unregister(shm._name, "shared_memory")
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    array.flags.writeable = False
+    try:
+        yield array
+    finally:
+        del array
+        shm.close()
+
+def release_job(job_id: str):
+    """Unlink every buffer created for a job and remove its working directory."""
+    path = job_dir(job_id)
+    manifest = os.path.join(path, MANIFEST)
+    if os.path.exists(manifest):
+        with open(manifest) as f:
+            names = json.load(f)
+        for name in names:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+    shutil.rmtree(path, ignore_errors=True)
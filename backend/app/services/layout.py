@@ -0,0 +1,32 @@
+# Template grid layout shared by the template renderer (API) and the
+# tracer (worker). Kept dependency-free so either side can import it.
+
+DEFAULT_CHARSET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+DEFAULT_COLS = 9
+MAX_CHARSET = 120
+MAX_COLS = 16
+
+# Default cell: the original 7.5" x 5.5" grid split into 9 x 7 (inches)
+DEFAULT_CELL_WIDTH = 7.5 / 9
+DEFAULT_CELL_HEIGHT = 5.5 / 7
+DEFAULT_CELL_ASPECT = DEFAULT_CELL_WIDTH / DEFAULT_CELL_HEIGHT  # ~1.06 wide:tall
+MIN_CELL, MAX_CELL = 0.4, 2.0  # inches
+
+def grid_rows(charset: str, cols: int) -> int:
+    return -(-len(charset) // cols)
+
+def validate_layout(charset: str, cols: int, cell_width: float = DEFAULT_CELL_WIDTH,
+                    cell_height: float = DEFAULT_CELL_HEIGHT):
+    # Raises ValueError for layouts that cannot be printed or traced
+    if not charset:
+        raise ValueError("charset must not be empty")
+    if len(charset) > MAX_CHARSET:
+        raise ValueError(f"charset is limited to {MAX_CHARSET} characters")
+    if len(set(charset)) != len(charset):
+        raise ValueError("charset contains duplicate characters")
+    if any(ch.isspace() for ch in charset):
+        raise ValueError("charset must not contain whitespace")
+    if not 1 <= cols <= MAX_COLS:
+        raise ValueError(f"cols must be between 1 and {MAX_COLS}")
+    if not (MIN_CELL <= cell_width <= MAX_CELL and MIN_CELL <= cell_height <= MAX_CELL):
+        raise ValueError(f"cell size must be between {MIN_CELL} and {MAX_CELL} inches")
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+import cv2
+import numpy as np
+from fontTools.pens.basePen import BasePen
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.ttLib import TTFont
+
+DEFAULT_TEXT = "The quick brown fox\njumps over the lazy dog"
+MAX_TEXT_LENGTH = 200
+MIN_SIZE, MAX_SIZE = 8, 256
+CACHE_SIZE = 128   # rendered previews kept in memory (LRU)
+MARGIN = 0.25      # padding around the text, in ems
+CURVE_STEPS = 8    # line segments per Bezier when rasterizing
+
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+_JOB_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+class PreviewNotFound(LookupError):
+    """Raised when a job has no built font (yet)."""
+
+def font_path(job_id: str) -> str:
+    # Same location fontbuild.make_font writes to
+    if not _JOB_ID.match(job_id):
+        raise PreviewNotFound(job_id)
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "generated", f"{job_id}.otf")
+
+class PolygonPen(BasePen):
+    """Flatten glyph outlines into polygons (lists of points) for rasterizing."""
+
+    def __init__(self, glyphSet, transform):
+        super().__init__(glyphSet)
+        self.transform = transform
+        self.polygons = []
+        self._current = []
+
+    def _moveTo(self, pt):
+        self._current = [self.transform(pt)]
+
+    def _lineTo(self, pt):
+        self._current.append(self.transform(pt))
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        # Sample the cubic Bezier; quadratics are converted by BasePen
+        p0 = np.array(self._getCurrentPoint())
+        p1, p2, p3 = np.array(pt1), np.array(pt2), np.array(pt3)
+        for t in np.linspace(0, 1, CURVE_STEPS + 1)[1:]:
+            mt = 1 - t
+            pt = mt**3 * p0 + 3 * mt**2 * t * p1 + 3 * mt * t**2 * p2 + t**3 * p3
+            self._current.append(self.transform(pt))
+
+    def _closePath(self):
+        if len(self._current) > 2:
+            self.polygons.append(self._current)
+        self._current = []
+
+    _endPath = _closePath
+
+def layout(font: TTFont, text: str) -> tuple:
+    """
+    Position each character of `text` in font units.
+    Returns [(glyph_name, x, line)], the widest line and the line count.
+    """
+    cmap = font.getBestCmap()
+    hmtx = font["hmtx"]
+    placed = []
+    widest = 0
+    lines = text.split("\n")
+    for line_no, line in enumerate(lines):
+        x = 0
+        for ch in line:
+            name = cmap.get(ord(ch), ".notdef")
+            # Missing glyphs advance like a space instead of drawing .notdef boxes
+            if ch != " " and name != ".notdef":
+                placed.append((name, x, line_no))
+            x += hmtx[name][0]
+        widest = max(widest, x)
+    return placed, widest, len(lines)
+
+def render(job_id: str, text: str, fmt: str, size: int) -> bytes:
+    """Render `text` with the job's font, `size` pixels per em."""
+    path = font_path(job_id)
+    if not os.path.exists(path):
+        raise PreviewNotFound(job_id)
+
+    font = TTFont(path)
+    glyph_set = font.getGlyphSet()
+    upm = font["head"].unitsPerEm
+    ascent = font["hhea"].ascent
+    line_height = ascent - font["hhea"].descent
+
+    placed, widest, n_lines = layout(font, text)
+    scale = size / upm
+    margin = MARGIN * upm
+    width = int(np.ceil((widest + 2 * margin) * scale))
+    height = int(np.ceil((n_lines * line_height + 2 * margin) * scale))
+
+    if fmt == "svg":
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+                 f"<title>{escape(text)}</title>",
+                 '<rect width="100%" height="100%" fill="white"/>']
+        for name, x, line_no in placed:
+            pen = SVGPathPen(glyph_set)
+            glyph_set[name].draw(pen)
+            d = pen.getCommands()
+            if not d:
+                continue
+            # Font units are y-up; flip around the line's baseline
+            tx = (margin + x) * scale
+            ty = (margin + ascent + line_no * line_height) * scale
+            parts.append(f'<path d="{d}" transform="translate({tx:.2f} {ty:.2f}) scale({scale:.5f} {-scale:.5f})"/>')
+        parts.append("</svg>")
+        return "\n".join(parts).encode("utf-8")
+
+    img = np.full((height, width), 255, dtype=np.uint8)
+    polygons = []
+    for name, x, line_no in placed:
+        baseline = margin + ascent + line_no * line_height
+        def to_px(pt, x=x, baseline=baseline):
+            return ((margin + x + pt[0]) * scale, (baseline - pt[1]) * scale)
+        pen = PolygonPen(glyph_set, to_px)
+        glyph_set[name].draw(pen)
+        polygons.extend(pen.polygons)
+    if polygons:
+        # Fill all contours together so counters (holes) stay open;
+        # 4 fractional bits keeps sub-pixel precision
+        pts = [np.round(np.array(p) * 16).astype(np.int32) for p in polygons]
+        cv2.fillPoly(img, pts, 0, lineType=cv2.LINE_AA, shift=4)
+    ok, buf = cv2.imencode(".png", img)
+    if not ok:
+        raise ValueError("Could not encode preview")
+    return buf.tobytes()
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def get_preview(job_id: str, text: str = DEFAULT_TEXT, fmt: str = "png", size: int = 64) -> tuple:
+    """
+    Cached render. Returns (content, media_type, etag).
+    Entries are keyed by the font's mtime too, so a rebuilt font never
+    serves a stale preview; the least recently used entry is evicted first.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    # Control characters (and the like) cannot appear in the SVG's XML;
+    # newlines separate lines
+    if not all(ch.isprintable() or ch == "\n" for ch in text):
+        raise ValueError("text contains non-printable characters")
+    text = text[:MAX_TEXT_LENGTH]
+    size = min(max(size, MIN_SIZE), MAX_SIZE)
+
+    path = font_path(job_id)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        raise PreviewNotFound(job_id)
+
+    key = (job_id, mtime, text, fmt, size)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    content = render(job_id, text, fmt, size)
+    etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+    entry = (content, FORMATS[fmt], etag)
+
+    with _lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
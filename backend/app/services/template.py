@@ -0,0 +1,112 @@
+"""Render printable handwriting templates (PDF) from layout parameters."""
+import hashlib
+import io
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4, legal, letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+from .layout import (DEFAULT_CELL_HEIGHT, DEFAULT_CELL_WIDTH, DEFAULT_CHARSET, DEFAULT_COLS,
+                     grid_rows, validate_layout)
+
+PAPER_SIZES = {"letter": letter, "a4": A4, "legal": legal}
+
+MIN_DPI, MAX_DPI = 150, 1200
+CACHE_SIZE = 32  # rendered variants kept in memory (LRU)
+
+GRID_TOP = 3 * inch       # from the top of the page, below title + instructions
+GRID_BOTTOM = 0.75 * inch # keep clear of the footer
+
+def render_template(charset: str = DEFAULT_CHARSET, cols: int = DEFAULT_COLS,
+                    cell_width: float = DEFAULT_CELL_WIDTH, cell_height: float = DEFAULT_CELL_HEIGHT,
+                    paper: str = "letter", dpi: int = 300) -> bytes:
+    """
+    Draw the template and return the PDF bytes.
+    Cell sizes are in inches; dpi is the scan resolution we ask users for.
+    Raises ValueError for layouts that do not fit the page.
+    """
+    validate_layout(charset, cols, cell_width, cell_height)
+    if paper not in PAPER_SIZES:
+        raise ValueError(f"paper must be one of: {', '.join(PAPER_SIZES)}")
+    if not MIN_DPI <= dpi <= MAX_DPI:
+        raise ValueError(f"dpi must be between {MIN_DPI} and {MAX_DPI}")
+
+    width, height = PAPER_SIZES[paper]
+    rows = grid_rows(charset, cols)
+    cell_w = cell_width * inch
+    cell_h = cell_height * inch
+    grid_width = cols * cell_w
+    grid_height = rows * cell_h
+    if grid_width > width - 0.5*inch or grid_height > height - GRID_TOP - GRID_BOTTOM:
+        raise ValueError("grid does not fit on the page, use smaller cells or more columns")
+
+    buf = io.BytesIO()
+    # invariant: no timestamps or random IDs, so equal parameters give equal bytes
+    c = canvas.Canvas(buf, pagesize=(width, height), invariant=1)
+
+    # Title
+    c.setFont("Helvetica-Bold", 20)
+    c.drawCentredString(width/2, height - 0.5*inch, "Handwriting Font Template")
+
+    # Instructions
+    c.setFont("Helvetica", 10)
+    instructions = [
+        "Instructions:",
+        "1. Print this template",
+        "2. Write each character clearly in its box using a dark pen",
+        f"3. Scan the completed template at {dpi} DPI or higher",
+        "4. Upload the scan to generate your custom font"
+    ]
+    y = height - inch
+    for line in instructions:
+        c.drawString(0.5*inch, y, line)
+        y -= 0.15*inch
+
+    # Starting position (centered)
+    start_x = (width - grid_width) / 2
+    start_y = height - GRID_TOP
+
+    # Draw grid
+    c.setLineWidth(0.5)
+    c.setStrokeColorRGB(0, 0, 0)
+
+    # Every cell of the rows x cols grid is drawn, including the unused ones
+    # after the last character: the scan pipeline finds the grid by its
+    # outer rectangle, which a partial last row would leave open
+    for i in range(rows * cols):
+        row, col = divmod(i, cols)
+        x = start_x + col * cell_w
+        y = start_y - row * cell_h
+
+        # Draw cell border
+        c.rect(x, y - cell_h, cell_w, cell_h)
+        if i >= len(charset):
+            continue
+
+        # Draw character label (small, centered just below the box)
+        c.setFont("Helvetica", 8)
+        c.setFillColorRGB(0.5, 0.5, 0.5)
+        c.drawCentredString(x + cell_w/2, y - cell_h - 10, charset[i])
+
+    # Footer
+    c.setFont("Helvetica", 8)
+    c.setFillColorRGB(0.3, 0.3, 0.3)
+    c.drawCentredString(width/2, 0.5*inch, "Write each character in the center of its box")
+
+    c.save()
+    return buf.getvalue()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached(charset, cols, cell_width, cell_height, paper, dpi) -> tuple:
+    pdf = render_template(charset, cols, cell_width, cell_height, paper, dpi)
+    return pdf, '"' + hashlib.sha1(pdf).hexdigest() + '"'
+
+def get_template(charset: str = DEFAULT_CHARSET, cols: int = DEFAULT_COLS,
+                 cell_width: float = DEFAULT_CELL_WIDTH, cell_height: float = DEFAULT_CELL_HEIGHT,
+                 paper: str = "letter", dpi: int = 300) -> tuple:
+    """
+    Memoized render_template. Returns (pdf_bytes, etag).
+    Parameters are normalized first so equivalent requests share an entry.
+    """
+    return _cached(charset, int(cols), float(cell_width), float(cell_height), paper.lower(), int(dpi))
@@ -4,6 +4,10 @@ import subprocess
 import os
 import uuid
 import xml.etree.ElementTree as ET
+from fontTools.pens.svgPathPen import SVGPathPen
+from fontTools.pens.transformPen import TransformPen
+from fontTools.svgLib.path import parse_path
+from .layout import DEFAULT_CELL_ASPECT, DEFAULT_CHARSET, DEFAULT_COLS, grid_rows
 
 def roughen_glyph(img: np.ndarray) -> np.ndarray:
     """
@@ -53,7 +57,10 @@ def order_points(pts):
     
     return rect
 
-def detect_and_warp_grid(img: np.ndarray) -> np.ndarray:
+WARP_CELL_HEIGHT = 250  # px per grid row after the perspective warp
+
+def detect_and_warp_grid(img: np.ndarray, rows: int = 7, cols: int = DEFAULT_COLS,
+                         cell_aspect: float = DEFAULT_CELL_ASPECT) -> np.ndarray:
     # 1. Preprocess
     # Blur to reduce noise
     blurred = cv2.GaussianBlur(img, (5, 5), 0)
@@ -65,7 +72,9 @@ def detect_and_warp_grid(img: np.ndarray) -> np.ndarray:
     
     # 3. Filter for the grid
     # We expect a large rectangle with specific aspect ratio
-    # Grid is 7.5" x 5.5" => AR = 1.36
+    # Default grid is 7.5" x 5.5" => AR = 1.36, cells are ~1.06 wide:tall;
+    # custom templates pass their own cell_aspect (width / height)
+    expected_ar = cols / rows * cell_aspect
     grid_cnt = None
     max_area = 0
     
@@ -89,7 +98,7 @@ def detect_and_warp_grid(img: np.ndarray) -> np.ndarray:
             cv2.drawContours(debug_img, [approx], -1, (0, 0, 255), 2)
             
             # Check AR (allow some perspective distortion)
-            if 1.0 < ar < 1.8:
+            if 0.7 * expected_ar < ar < 1.25 * expected_ar:
                 if area > max_area:
                     max_area = area
                     grid_cnt = approx
@@ -114,11 +123,10 @@ def detect_and_warp_grid(img: np.ndarray) -> np.ndarray:
     pts = grid_cnt.reshape(4, 2)
     rect = order_points(pts)
     
-    # Target dimensions (fixed size for 7x9 grid)
-    # 9 cols * 250px = 2250
-    # 7 rows * 250px = 1750
-    # This gives us nice square-ish cells
-    dst_w, dst_h = 2250, 1750
+    # Target dimensions: cells 250px tall, as wide as their aspect
+    # Default: 9 cols * 265px = 2385, 7 rows * 250px = 1750
+    # so glyphs keep the proportions they were written with
+    dst_w, dst_h = cols * round(WARP_CELL_HEIGHT * cell_aspect), rows * WARP_CELL_HEIGHT
     
     dst = np.array([
         [0, 0],
@@ -133,11 +141,349 @@ def detect_and_warp_grid(img: np.ndarray) -> np.ndarray:
     
     return warped
 
-from pdf2image import convert_from_bytes
+# Pre-screen thresholds (fractions are relative to one grid cell)
+MIN_SPECKLE_AREA = 0.0002  # components smaller than this x cell area are scanner speckle
+MIN_GLYPH_EXTENT = 0.12    # a cell's largest component must span this much of the cell
+MAX_LINE_THICKNESS = 0.06  # thin border fragments up to this x cell size are grid line residue
+MAX_CELL_DENSITY = 0.6     # more ink than this in a cell is a blot, not a glyph
+MAX_PAGE_DENSITY = 0.35    # more ink than this on the page means a dark or inverted scan
+MIN_CELL_PIXELS = 8        # located cells smaller than this (px) cannot hold a glyph
+CELL_PAD = 0.1             # inset from each cell border, avoids the grid lines
+# Characters that are legitimately tiny: their cells skip the glyph extent rule.
+# Low marks may sit on the bottom border and high marks on the top one, where
+# they would pass for grid line fragments, so those bands keep them
+LOW_MARKS = frozenset(".,_-")
+HIGH_MARKS = frozenset("'\"`^*\u00b0")
+SMALL_GLYPHS = LOW_MARKS | HIGH_MARKS | frozenset(":;~\u00b7")
+# The template prints each label centred just below its cell, i.e. at the top
+# of the cell underneath: marks wholly inside that spot are label, not handwriting
+LABEL_BAND = 0.25          # label spot: the top of the cell...
+LABEL_HALF_WIDTH = 0.1     # ...this far either side of the cell's centre line
+
+# Grid localization
+MAX_LINE_CANDIDATES = 200  # strongest profile peaks considered as grid lines, per axis
+PITCH_TOLERANCE = 0.08     # grid lines may sit this far (x pitch) from the regular lattice
+MIN_LINE_COVERAGE = 0.25   # a grid line is inked along this much of the page, or we fall back
+GLYPH_MARGIN = 4           # px kept around a glyph's tight bounding box
+POTRACE_UNITS = 10         # potrace SVG coordinates are 10x pixels, y-up from the bitmap bottom
+
+class UnusableScanError(ValueError):
+    """Raised when the pre-screen rejects a scan before any tracing starts."""
+
+def grid_edges(w: int, h: int, rows: int, cols: int) -> tuple:
+    # Equal division of the warped grid into rows x cols cells
+    # Returns the cols+1 x-boundaries and rows+1 y-boundaries
+    xs = np.arange(cols + 1) * (w // cols)
+    ys = np.arange(rows + 1) * (h // rows)
+    return xs, ys
+
+def find_line_peaks(profile: np.ndarray) -> tuple:
+    """
+    Candidate grid lines on one axis: thin, local maxima of the ink
+    projection profile. Wide bands (scanner borders, shadows) are not lines.
+    Returns (positions, strengths), sorted by position.
+    """
+    length = len(profile)
+    # Merge 2-3 px wide lines into one peak
+    smooth = np.convolve(profile, np.ones(5) / 5, mode="same")
+    left = np.r_[-1, smooth[:-1]]
+    right = np.r_[smooth[1:], -1]
+    peaks = np.flatnonzero((smooth > 0) & (smooth >= left) & (smooth > right))
+    
+    # Line-like: the profile drops to half within max_width on both sides
+    max_width = max(8, length // 100)
+    padded = np.r_[np.zeros(max_width), smooth, np.zeros(max_width)]
+    half = 0.5 * smooth[peaks]
+    peaks = peaks[(padded[peaks] < half) & (padded[peaks + 2 * max_width] < half)]
+    
+    # Strongest first, suppressing neighbours of an accepted peak
+    order = peaks[np.argsort(smooth[peaks])[::-1]]
+    kept = []
+    for x in order[:MAX_LINE_CANDIDATES]:
+        if all(abs(x - k) > max_width for k in kept):
+            kept.append(x)
+    kept = np.array(sorted(kept), dtype=np.int64)
+    return kept, smooth[kept]
+
+def score_lattices(lines: np.ndarray, pos: np.ndarray, strength: np.ndarray, tol: float) -> tuple:
+    # Line ink each lattice lands on: strength of the nearest candidate within tol
+    idx = np.clip(np.searchsorted(pos, lines), 1, len(pos) - 1)
+    nearer = np.where(np.abs(pos[idx - 1] - lines) <= np.abs(pos[idx] - lines), idx - 1, idx)
+    hit = np.abs(pos[nearer] - lines) <= tol
+    score = np.where(hit, strength[nearer], 0).sum(axis=1)
+    return score, nearer, hit
+
+def fit_grid_lines(profile: np.ndarray, n: int) -> np.ndarray:
+    """
+    Locate the n+1 lines of one grid axis from an ink projection profile.
+    Estimates the pitch from the spacing between candidate lines, fits the
+    regular lattice that lands on the most line ink, then snaps each line
+    to its candidate, so small warp errors and uneven lines are absorbed.
+    Memory and time depend on the number of candidates, not the page size.
+    Returns None when no regular grid of n cells is visible.
+    """
+    pos, strength = find_line_peaks(profile)
+    if len(pos) < 2:
+        return None
+    min_pitch = 2 * max(8, len(profile) // 100)
+    
+    # 1. Pitch hypotheses: spacings shared by many pairs of strong lines
+    i, j = np.triu_indices(len(pos), k=1)
+    diffs = (pos[j] - pos[i]).astype(np.float64)
+    weights = np.minimum(strength[i], strength[j])
+    keep = diffs >= min_pitch
+    diffs, weights = diffs[keep], weights[keep]
+    if not len(diffs):
+        return None
+    order = np.argsort(diffs)
+    diffs, weights = diffs[order], weights[order]
+    cum = np.r_[0, np.cumsum(weights)]
+    cum_d = np.r_[0, np.cumsum(weights * diffs)]
+    tol = np.maximum(3, PITCH_TOLERANCE * diffs)
+    lo = np.searchsorted(diffs, diffs - tol)
+    hi = np.searchsorted(diffs, diffs + tol, side="right")
+    support = cum[hi] - cum[lo]
+    # Each hypothesis is the weighted mean of the spacings that support it
+    centre = (cum_d[hi] - cum_d[lo]) / support
+    pitches = []
+    for k in np.argsort(support)[::-1]:
+        if all(abs(centre[k] - p) > PITCH_TOLERANCE * p for p in pitches):
+            pitches.append(centre[k])
+        if len(pitches) == 5:
+            break
+    
+    # 2. For each pitch, every lattice with some candidate as its m-th line
+    best = None
+    for pitch in pitches:
+        tol = max(3, PITCH_TOLERANCE * pitch)
+        starts = (pos[:, None] - pitch * np.arange(n + 1)[None, :]).ravel()
+        lines = starts[:, None] + pitch * np.arange(n + 1)[None, :]
+        inside = (lines[:, 0] >= -tol) & (lines[:, -1] <= len(profile) - 1 + tol)
+        lines = lines[inside]
+        if not len(lines):
+            continue
+        score, nearer, hit = score_lattices(lines, pos, strength, tol)
+        k = int(np.argmax(score))
+        lattice = lines[k]
+        # Least-squares refit of offset and pitch on the lines it hit
+        if np.count_nonzero(hit[k]) >= 2:
+            m = np.flatnonzero(hit[k])
+            slope, offset = np.polyfit(m, pos[nearer[k][m]], 1)
+            refit = (offset + slope * np.arange(n + 1))[None, :]
+            refit_score, refit_nearer, refit_hit = score_lattices(refit, pos, strength, tol)
+            if refit_score[0] >= score[k]:
+                lattice, score, nearer, hit, k = refit[0], refit_score, refit_nearer, refit_hit, 0
+        if best is None or score[k] > best[0]:
+            best = (score[k], lattice, nearer[k], hit[k])
+    if best is None:
+        return None
+    
+    _, lines, nearer, hit = best
+    if np.count_nonzero(hit) < (n + 1) - (n + 1) // 4:
+        return None
+    # Snap to the drawn lines; keep the lattice where a line is missing
+    lines = np.where(hit, pos[nearer], np.round(lines))
+    return np.clip(lines, 0, len(profile) - 1).astype(np.int64)
+
+def locate_cells(binary: np.ndarray, rows: int, cols: int) -> tuple:
+    """
+    Cell boundaries from the grid lines actually drawn on the page.
+    Input: binarized page (ink=255), warped or (after a failed warp) not.
+    Falls back to equal division when no grid lines are visible.
+    """
+    h, w = binary.shape
+    # Projection profiles: ink per column / per row (no full-page temporaries)
+    col_profile = cv2.reduce(binary, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel() / 255.0
+    row_profile = cv2.reduce(binary, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel() / 255.0
+    
+    xs = fit_grid_lines(col_profile, cols)
+    ys = fit_grid_lines(row_profile, rows)
+    if xs is None or ys is None:
+        return grid_edges(w, h, rows, cols)
+    
+    # Real grid lines run along most of the grid; glyph strokes don't
+    if (np.median(col_profile[xs]) < MIN_LINE_COVERAGE * (ys[-1] - ys[0])
+            or np.median(row_profile[ys]) < MIN_LINE_COVERAGE * (xs[-1] - xs[0])):
+        return grid_edges(w, h, rows, cols)
+    
+    return xs, ys
+
+def offset_path(d: str, dx: float, dy: float) -> str:
+    # Translate SVG path data (used to undo cropping before tracing)
+    pen = SVGPathPen(None)
+    parse_path(d, TransformPen(pen, (1, 0, 0, 1, dx, dy)))
+    return pen.getCommands()
+
+def strip_grid_lines(binary: np.ndarray, cell_w: int, cell_h: int) -> tuple:
+    """
+    Remove residual grid lines from a binarized page (ink=255).
+    Anything that survives an opening with a full-cell-long kernel
+    cannot be handwriting inside a cell, so it must be a grid line.
+    """
+    h_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (cell_w, 1))
+    v_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, cell_h))
+    lines = cv2.bitwise_or(
+        cv2.morphologyEx(binary, cv2.MORPH_OPEN, h_kernel),
+        cv2.morphologyEx(binary, cv2.MORPH_OPEN, v_kernel),
+    )
+    # Grow the mask a little so the anti-aliased fringe of each line goes too
+    lines = cv2.dilate(lines, np.ones((3, 3), np.uint8))
+    clean = cv2.bitwise_and(binary, cv2.bitwise_not(lines))
+    return clean, cv2.countNonZero(lines)
+
+def prescreen_cells(binary: np.ndarray, xs: np.ndarray, ys: np.ndarray, chars: str = "") -> tuple:
+    """
+    Cheap per-cell screening computed for the whole page at once.
+    Input: binarized page (ink=255), the cell boundaries and optionally the
+    characters filling the cells row by row, for the small glyph exceptions.
+    Returns the cleaned page, a verdict per cell ("ok", "empty", "noise"
+    or "blot") in row-major order, and counts of what was removed.
+    """
+    rows, cols = len(ys) - 1, len(xs) - 1
+    cell_chars = list(chars[:rows * cols]) + [""] * max(rows * cols - len(chars), 0)
+    small_cells = np.array([c in SMALL_GLYPHS for c in cell_chars], dtype=bool)
+    low_cells = np.array([c in LOW_MARKS for c in cell_chars], dtype=bool)
+    high_cells = np.array([c in HIGH_MARKS for c in cell_chars], dtype=bool)
+    cell_ws = np.diff(xs)
+    cell_hs = np.diff(ys)
+    cell_w = int(cell_ws.min())
+    cell_h = int(cell_hs.min())
+
+    # 1. Strip grid lines with morphology
+    clean, line_pixels = strip_grid_lines(binary, cell_w, cell_h)
+
+    # 2. Connected components over the whole page in one pass
+    n, labels, cc, centroids = cv2.connectedComponentsWithStats(clean, connectivity=8)
+    areas = cc[:, cv2.CC_STAT_AREA]
+    comp_w = cc[:, cv2.CC_STAT_WIDTH]
+    comp_h = cc[:, cv2.CC_STAT_HEIGHT]
+
+    # Assign each component to the cell its centroid falls in
+    col_idx = np.clip(np.searchsorted(xs, centroids[:, 0], side="right") - 1, 0, cols - 1)
+    row_idx = np.clip(np.searchsorted(ys, centroids[:, 1], side="right") - 1, 0, rows - 1)
+    own_w = cell_ws[col_idx]
+    own_h = cell_hs[row_idx]
+    cell_idx = row_idx * cols + col_idx
+
+    # Speckle: too small to be part of any glyph
+    speckle = areas < MIN_SPECKLE_AREA * own_w * own_h
 
-def extract_glyphs(img_bytes: bytes) -> dict:
+    # Line fragments: thin, elongated and sitting in the inset band along a cell border
+    # (what is left of a grid line that was not perfectly straight after warping),
+    # unless the cell's character is a mark written there, like '_' or '`'
+    local_x = (centroids[:, 0] - xs[col_idx]) / own_w
+    local_y = (centroids[:, 1] - ys[row_idx]) / own_h
+    in_band_x = (local_x < CELL_PAD) | (local_x > 1 - CELL_PAD)
+    in_band_y = (local_y < CELL_PAD) | (local_y > 1 - CELL_PAD)
+    horiz = (comp_h <= MAX_LINE_THICKNESS * own_h) & (comp_w >= 4 * comp_h) & in_band_y
+    vert = (comp_w <= MAX_LINE_THICKNESS * own_w) & (comp_h >= 4 * comp_w) & in_band_x
+    mark_band = ((low_cells[cell_idx] & (local_y > 1 - CELL_PAD))
+                 | (high_cells[cell_idx] & (local_y < CELL_PAD)))
+    fragment = (horiz | vert) & ~speckle & ~mark_band
+
+    # Printed labels: below the first row, every cell has the label of the cell
+    # above at the top centre. A component wholly inside that spot is the label
+    # (strokes of the glyph reaching into it are part of a larger component)
+    comp_extent = np.maximum(comp_w / own_w, comp_h / own_h)
+    left = (cc[:, cv2.CC_STAT_LEFT] - xs[col_idx]) / own_w
+    right = left + comp_w / own_w
+    bottom = (cc[:, cv2.CC_STAT_TOP] + comp_h - ys[row_idx]) / own_h
+    label = ((row_idx >= 1) & (left >= 0.5 - LABEL_HALF_WIDTH) & (right <= 0.5 + LABEL_HALF_WIDTH)
+             & (bottom <= LABEL_BAND) & ~speckle)
+
+    # Ink outside the located grid (title, instructions, page edges) is never a glyph
+    outside = ((centroids[:, 0] < xs[0]) | (centroids[:, 0] >= xs[-1])
+               | (centroids[:, 1] < ys[0]) | (centroids[:, 1] >= ys[-1]))
+    
+    keep = ~(speckle | fragment | outside | label)
+    keep[0] = False # Label 0 is the background
+    clean = np.where(keep[labels], 255, 0).astype(np.uint8)
+
+    # 3. Ink inside each cell's inset, via an integral image (no per-cell loop)
+    integral = cv2.integral(clean // 255)
+    x0 = xs[:-1] + (cell_ws * CELL_PAD).astype(int)
+    x1 = xs[1:] - (cell_ws * CELL_PAD).astype(int)
+    y0 = ys[:-1] + (cell_hs * CELL_PAD).astype(int)
+    y1 = ys[1:] - (cell_hs * CELL_PAD).astype(int)
+    ink = (integral[y1[:, None], x1[None, :]] - integral[y0[:, None], x1[None, :]]
+           - integral[y1[:, None], x0[None, :]] + integral[y0[:, None], x0[None, :]])
+    density = ink / ((y1 - y0)[:, None] * (x1 - x0)[None, :])
+
+    # Largest component extent per cell, relative to the cell size
+    extent = np.zeros(rows * cols)
+    np.maximum.at(extent, cell_idx[keep], comp_extent[keep])
+
+    ink = ink.ravel()
+    density = density.ravel()
+    verdicts = np.full(rows * cols, "ok", dtype=object)
+    verdicts[density > MAX_CELL_DENSITY] = "blot"
+    verdicts[(extent < MIN_GLYPH_EXTENT) & ~small_cells] = "noise"
+    verdicts[ink == 0] = "empty"
+
+    removed = {
+        "speckles": int(np.count_nonzero(speckle[1:])),
+        "line_fragments": int(np.count_nonzero(fragment[1:])),
+        "line_pixels": int(line_pixels),
+        "outside_grid": int(np.count_nonzero(outside[1:] & ~speckle[1:])),
+    }
+    return clean, list(verdicts), removed
+
+def summarize_prescreen(verdicts: list, removed: dict, page_density: float) -> dict:
+    rejected = {"empty": 0, "noise": 0, "blot": 0}
+    for v in verdicts:
+        if v != "ok":
+            rejected[v] += 1
+    return {
+        "cells": len(verdicts),
+        "accepted": verdicts.count("ok"),
+        "rejected": rejected,
+        "removed": removed,
+        "page_density": round(page_density, 4),
+    }
+
+def trace_bitmap(bitmap: np.ndarray) -> str:
+    """
+    Trace a bitmap with potrace and return the joined SVG path data.
+    Input: Grayscale image (0=black ink, 255=white paper)
+    Returns an empty string when potrace finds no paths.
+    """
+    tmp_id = str(uuid.uuid4())
+    bmp_path = f"/tmp/{tmp_id}.bmp"
+    svg_path = f"/tmp/{tmp_id}.svg"
+    
+    try:
+        cv2.imwrite(bmp_path, bitmap)
+        
+        # Run potrace
+        # -s: SVG
+        # --flat: simpler paths
+        subprocess.run(["potrace", "-s", "--flat", "-o", svg_path, bmp_path], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        paths = []
+        if os.path.exists(svg_path):
+            root = ET.parse(svg_path).getroot()
+            # SVG usually has a namespace
+            for path in root.findall(".//{http://www.w3.org/2000/svg}path"):
+                d = path.get('d')
+                if d:
+                    paths.append(d)
+        return " ".join(paths)
+    finally:
+        if os.path.exists(bmp_path): os.remove(bmp_path)
+        if os.path.exists(svg_path): os.remove(svg_path)
+
+def prepare_page(img_bytes: bytes, rows: int = 7, cols: int = DEFAULT_COLS,
+                 cell_aspect: float = DEFAULT_CELL_ASPECT) -> tuple:
+    """
+    Decode a scan, warp the grid and binarize it.
+    cell_aspect is the template's cell width / height.
+    Returns (warped, binary); binary has ink=255 on black.
+    """
     # Check if PDF
     if img_bytes.startswith(b'%PDF'):
+        # Imported lazily: poppler bindings are only needed for PDF uploads
+        from pdf2image import convert_from_bytes
+        
         # Convert first page to image
         images = convert_from_bytes(img_bytes)
         if not images:
@@ -155,80 +501,93 @@ def extract_glyphs(img_bytes: bytes) -> dict:
 
     # Detect and warp grid
     # This handles rotation, skew, and margins
-    warped = detect_and_warp_grid(img)
+    warped = detect_and_warp_grid(img, rows, cols, cell_aspect)
     
     # Threshold the warped image for character extraction
     # (Inverted: Text is white, background black)
     _, binary = cv2.threshold(warped, 128, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
     
+    return warped, binary
+
+def extract_glyphs(img_bytes: bytes, stats: dict = None, chars: str = DEFAULT_CHARSET, cols: int = DEFAULT_COLS,
+                   cell_aspect: float = DEFAULT_CELL_ASPECT) -> dict:
+    warped, binary = prepare_page(img_bytes, grid_rows(chars, cols), cols, cell_aspect)
+    return trace_page(binary, stats, chars, cols)
+
+def trace_page(binary: np.ndarray, stats: dict = None, chars: str = DEFAULT_CHARSET, cols: int = DEFAULT_COLS) -> dict:
+    """
+    Pre-screen and trace every cell of a binarized, warped page.
+    `chars` fill the grid row by row, `cols` per row, like the template.
+    Fills `stats` with the pre-screen summary when given.
+    """
     # Grid logic
-    h, w = warped.shape
-    rows = 7
-    cols = 9
-    cell_w = w // cols
-    cell_h = h // rows
+    h, w = binary.shape
+    rows = grid_rows(chars, cols)
+    xs, ys = locate_cells(binary, rows, cols)
+    # No grid found on a page too small for it: nothing to screen or trace
+    if min(np.diff(xs).min(), np.diff(ys).min()) < MIN_CELL_PIXELS:
+        raise UnusableScanError(f"Scan is too small ({w}x{h} px) to hold the template grid")
     
-    chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
     results = {}
     
+    # Pre-screen every cell at once before paying for any tracing
+    if stats is None:
+        stats = {}
+    page_density = cv2.countNonZero(binary) / binary.size
+    stats["page_density"] = round(page_density, 4)
+    if page_density > MAX_PAGE_DENSITY:
+        raise UnusableScanError(f"Scan is too dark ({page_density:.0%} ink), is it inverted or underexposed?")
+    
+    binary, verdicts, removed = prescreen_cells(binary, xs, ys, chars)
+    verdicts = verdicts[:len(chars)]
+    summary = summarize_prescreen(verdicts, removed, page_density)
+    stats.update(summary)
+    if summary["accepted"] == 0:
+        raise UnusableScanError("No handwriting found in any cell")
+    
     for i, char in enumerate(chars):
+        # Skip empty, speckle-only and blotted cells
+        if verdicts[i] != "ok":
+            continue
+        
         r = i // cols
         c = i % cols
         
-        x = c * cell_w
-        y = r * cell_h
+        x = xs[c]
+        y = ys[r]
+        cell_w = xs[c + 1] - x
+        cell_h = ys[r + 1] - y
         
         # Extract cell
-        pad_x = int(cell_w * 0.1)
-        pad_y = int(cell_h * 0.1)
+        pad_x = int(cell_w * CELL_PAD)
+        pad_y = int(cell_h * CELL_PAD)
         
         roi = binary[y+pad_y : y+cell_h-pad_y, x+pad_x : x+cell_w-pad_x]
         
-        # Check if empty
-        if cv2.countNonZero(roi) == 0:
-            continue
+        # Crop to the glyph's tight bounding box: potrace only sees the ink
+        roi_h, roi_w = roi.shape
+        gx, gy, gw, gh = cv2.boundingRect(roi)
+        x0, y0 = max(gx - GLYPH_MARGIN, 0), max(gy - GLYPH_MARGIN, 0)
+        x1, y1 = min(gx + gw + GLYPH_MARGIN, roi_w), min(gy + gh + GLYPH_MARGIN, roi_h)
+        glyph = roi[y0:y1, x0:x1]
             
         # Potrace needs black text on white background
-        # We have white text on black background (roi)
+        # We have white text on black background (glyph)
         # So invert it
-        roi_inv = cv2.bitwise_not(roi)
+        glyph_inv = cv2.bitwise_not(glyph)
         
         # Apply roughness filter to simulate penmanship
-        roi_inv = roughen_glyph(roi_inv)
-        
-        tmp_id = str(uuid.uuid4())
-        bmp_path = f"/tmp/{tmp_id}.bmp"
-        svg_path = f"/tmp/{tmp_id}.svg"
+        glyph_inv = roughen_glyph(glyph_inv)
         
         try:
-            cv2.imwrite(bmp_path, roi_inv)
-            
-            # Run potrace
-            # -s: SVG
-            # --flat: simpler paths
-            subprocess.run(["potrace", "-s", "--flat", "-o", svg_path, bmp_path], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            if os.path.exists(svg_path):
-                tree = ET.parse(svg_path)
-                root = tree.getroot()
-                # Namespace handling
-                # SVG usually has a namespace
-                ns = {'svg': 'http://www.w3.org/2000/svg'}
-                
-                paths = []
-                # Find all paths
-                for path in root.findall(".//{http://www.w3.org/2000/svg}path"):
-                    d = path.get('d')
-                    if d:
-                        paths.append(d)
-                
-                if paths:
-                    results[char] = " ".join(paths)
-                    
+            d = trace_bitmap(glyph_inv)
+            if d:
+                # Put the outline back where it sat in the full cell, so
+                # baselines and descenders line up across glyphs
+                if x0 or roi_h - y1:
+                    d = offset_path(d, x0 * POTRACE_UNITS, (roi_h - y1) * POTRACE_UNITS)
+                results[char] = d
         except Exception as e:
             print(f"Error tracing {char}: {e}")
-        finally:
-            if os.path.exists(bmp_path): os.remove(bmp_path)
-            if os.path.exists(svg_path): os.remove(svg_path)
         
     return results
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Grid-cell localization accuracy: fixed equal division vs. cells located
+from the drawn grid lines, on synthetic pages with known geometry.
+
+Run from the repo root:
+    python backend/benchmarks/grid_accuracy.py [--seeds 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.tracing import CELL_PAD, GLYPH_MARGIN, grid_edges, locate_cells
+from synthetic import make_page
+
+ROWS, COLS = 7, 9
+
+# (name, page height, page width, grid box, line jitter)
+SCENARIOS = [
+    ("warped", 1750, 2250, (0, 0, 2249, 1749), 0),
+    ("warp error", 1750, 2250, (14, 10, 2200, 1720), 6),
+    ("unwarped", 3300, 2550, (150, 600, 2250, 1650), 0),
+]
+
+def insets(xs, ys):
+    # Same inset ROIs trace_page cuts, in row-major order
+    for r in range(ROWS):
+        for c in range(COLS):
+            cell_w, cell_h = xs[c + 1] - xs[c], ys[r + 1] - ys[r]
+            pad_x, pad_y = int(cell_w * CELL_PAD), int(cell_h * CELL_PAD)
+            yield (slice(max(ys[r] + pad_y, 0), max(ys[r] + cell_h - pad_y, 0)),
+                   slice(max(xs[c] + pad_x, 0), max(xs[c] + cell_w - pad_x, 0)))
+
+def score(page, xs, ys) -> dict:
+    h, w = page["img"].shape
+    true_xs = np.clip(page["xs"], 0, w - 1)
+    true_ys = np.clip(page["ys"], 0, h - 1)
+    err = np.abs(np.concatenate([xs - true_xs, ys - true_ys]))
+
+    glyphs, lines = page["glyphs"], page["lines"]
+    captured = total = dirty = 0
+    crop_ratio = []
+    for i, roi in enumerate(insets(xs, ys)):
+        label = glyphs[roi] == i + 1
+        captured += np.count_nonzero(label)
+        total += np.count_nonzero(glyphs == i + 1)
+        if np.count_nonzero(lines[roi]):
+            dirty += 1
+        ink = ((glyphs[roi] > 0) | (lines[roi] > 0)).astype(np.uint8)
+        if ink.size and ink.any():
+            _, _, gw, gh = cv2.boundingRect(ink)
+            crop_ratio.append(min((gw + 2 * GLYPH_MARGIN) * (gh + 2 * GLYPH_MARGIN), ink.size) / ink.size)
+
+    return {
+        "mean_err": float(err.mean()),
+        "max_err": float(err.max()),
+        "capture": captured / max(total, 1),
+        "dirty_cells": dirty / (ROWS * COLS),
+        "crop": float(np.mean(crop_ratio)) if crop_ratio else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<12} {'method':<9} {'mean err':>9} {'max err':>8} {'glyph ink':>10} {'cells w/ border':>16} {'crop/inset':>11} {'locate':>9}")
+    for name, h, w, box, jitter in SCENARIOS:
+        for method in ("fixed", "adaptive"):
+            results, elapsed = [], []
+            for seed in range(args.seeds):
+                page = make_page(h, w, box, ROWS, COLS, jitter=jitter, seed=seed)
+                binary = np.where(page["img"] < 128, 255, 0).astype(np.uint8)
+                start = time.perf_counter()
+                if method == "fixed":
+                    xs, ys = grid_edges(w, h, ROWS, COLS)
+                else:
+                    xs, ys = locate_cells(binary, ROWS, COLS)
+                elapsed.append(time.perf_counter() - start)
+                results.append(score(page, xs, ys))
+            avg = {k: np.mean([r[k] for r in results]) for k in results[0]}
+            print(f"{name:<12} {method:<9} {avg['mean_err']:>7.1f}px {avg['max_err']:>6.0f}px "
+                  f"{avg['capture']:>9.1%} {avg['dirty_cells']:>16.1%} {avg['crop']:>10.1%} "
+                  f"{np.median(elapsed) * 1000:>7.1f}ms")
+
+if __name__ == "__main__":
+    main()
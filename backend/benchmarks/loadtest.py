@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Load test for the API + worker stack, fully local: no Redis server and
+no external broker. The real FastAPI app is served by uvicorn in-process
+and jobs run on a real Celery worker (prefork pool, N processes) fed by
+an in-memory broker, so task serialization (the scan bytes included) and
+process concurrency are part of what is measured. Job status lives in a
+stand-in for the Redis "jobs" hash, served by a manager process that the
+API and every pool process share. Virtual users upload synthetic scans
+to /upload and follow /ws/{job_id} until the job is DONE or FAILED.
+
+Latency is taken from the "finished" timestamp the worker writes into
+the status hash, not from when the 1 s /ws poll noticed it. A job that
+does not finish within --job-timeout (e.g. the worker crashed outside
+the FAILED handling) is counted as failed instead of stalling the run.
+
+Reports end-to-end latency percentiles, throughput and queue depth over
+time for every (workers, concurrency) pair, and where each worker count
+saturates.
+
+Run from the repo root:
+    python backend/benchmarks/loadtest.py --workers 1,2,4 --concurrency 1,2,4,8 --duration 30
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import uvicorn
+import websockets
+from celery.contrib.testing.worker import start_worker
+
+from backend.app import celery_app as celery_module
+from backend.app import main
+from backend import worker  # registers tasks.build_font
+from synthetic import make_scan
+
+TERMINAL_STATES = ("DONE", "FAILED")
+ACTIVE_STATES = ("TRACING", "BUILDING")
+
+class StatusStore:
+    """The subset of the redis client the app uses, kept in a dict."""
+
+    def __init__(self):
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def hset(self, name, key, value):
+        with self._lock:
+            self._hashes.setdefault(name, {})[key] = value
+        return 1
+
+    def hget(self, name, key):
+        with self._lock:
+            return self._hashes.get(name, {}).get(key)
+
+    def hmget(self, name, keys):
+        with self._lock:
+            values = self._hashes.get(name, {})
+            return [values.get(k) for k in keys]
+
+# Lives in the manager's server process; clients reach it through proxies
+_store = StatusStore()
+
+def _get_store():
+    return _store
+
+class StatusManager(BaseManager):
+    pass
+
+StatusManager.register("store", callable=_get_store)
+
+class SharedRedis:
+    """
+    Client side of the shared status store, installed as the app's redis
+    client. Prefork pool processes inherit this object, so it opens its
+    own manager connection once per process instead of reusing the
+    parent's socket.
+    """
+
+    def __init__(self, address, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._pid = None
+        self._store = None
+
+    def _proxy(self):
+        if self._pid != os.getpid():
+            manager = StatusManager(address=self.address, authkey=self.authkey)
+            manager.connect()
+            self._store = manager.store()
+            self._pid = os.getpid()
+        return self._store
+
+    def hset(self, name, key, value):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return self._proxy().hset(name, key, value)
+
+    def hget(self, name, key):
+        return self._proxy().hget(name, key)
+
+    def hmget(self, name, keys):
+        return self._proxy().hmget(name, keys)
+
+def configure_celery():
+    # Broker in this process: the API publishes, the embedded worker consumes
+    # and hands each job to a pool process. One job per process at a time,
+    # no result backend (the task reports through the status hash)
+    main.celery_app.conf.update(
+        broker_url="memory://localhost/",
+        result_backend=None,
+        task_ignore_result=True,
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+        worker_hijack_root_logger=False,
+    )
+
+@contextlib.contextmanager
+def celery_workers(n: int):
+    with start_worker(main.celery_app, pool="prefork", concurrency=n, perform_ping_check=False,
+                      loglevel="WARNING", shutdown_timeout=60):
+        yield
+    # Drop anything still queued when the run ended, so it does not spill into the next one
+    main.celery_app.control.purge()
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_api(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+async def follow(base: str, job_id: str) -> dict:
+    # Last status the API reports for the job over /ws
+    status = {"state": None}
+    async with websockets.connect(f"ws://{base}/ws/{job_id}") as ws:
+        async for message in ws:
+            status = json.loads(message)
+            if status.get("state") in TERMINAL_STATES:
+                break
+    return status
+
+async def virtual_user(base: str, scans: list, deadline: float, job_timeout: float, user: int,
+                       samples: list, job_ids: list):
+    async with httpx.AsyncClient(base_url=f"http://{base}", timeout=None) as client:
+        i = user
+        while time.perf_counter() < deadline:
+            scan = scans[i % len(scans)]
+            i += 1
+            # Wall clock, to compare with the worker's "finished" timestamp
+            start = time.time()
+            res = await client.post("/upload", files={"sample": ("scan.png", scan, "image/png")})
+            job_id = res.json()["job_id"]
+            job_ids.append(job_id)
+            uploaded = time.time()
+            try:
+                status = await asyncio.wait_for(follow(base, job_id), job_timeout)
+            except asyncio.TimeoutError:
+                status = {"state": "TIMEOUT"}
+            finished = status.get("finished") or time.time()
+            samples.append({"upload": uploaded - start, "total": finished - start, "state": status.get("state")})
+
+async def sample_queue(redis, job_ids: list, stop: asyncio.Event, start: float, depth: list, interval: float):
+    # Queued: uploaded but not picked up by a worker yet (no status); active: being processed
+    while not stop.is_set():
+        statuses = redis.hmget("jobs", list(job_ids)) if job_ids else []
+        states = [json.loads(s).get("state") if s else None for s in statuses]
+        depth.append((time.perf_counter() - start, states.count(None),
+                      sum(1 for state in states if state in ACTIVE_STATES)))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+async def drive(base: str, redis, scans: list, concurrency: int, duration: float, job_timeout: float,
+                interval: float) -> dict:
+    samples, job_ids, depth = [], [], []
+    start = time.perf_counter()
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_queue(redis, job_ids, stop, start, depth, interval))
+    # Users stop submitting at the deadline but finish (or time out) the job they are on
+    await asyncio.gather(*(virtual_user(base, scans, start + duration, job_timeout, u, samples, job_ids)
+                           for u in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    return {"samples": samples, "job_ids": job_ids, "depth": depth, "elapsed": elapsed}
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+def summarize(run: dict) -> dict:
+    # Latency and throughput over completed jobs; FAILED and timed-out jobs are counted as failed
+    done = [s for s in run["samples"] if s["state"] == "DONE"]
+    totals = [s["total"] for s in done] or [float("nan")]
+    return {
+        "jobs": len(run["samples"]),
+        "failed": len(run["samples"]) - len(done),
+        "per_min": len(done) / run["elapsed"] * 60,
+        "p50": percentile(totals, 50),
+        "p90": percentile(totals, 90),
+        "p99": percentile(totals, 99),
+        "upload_p50": statistics.median([s["upload"] for s in run["samples"]] or [float("nan")]),
+        "max_depth": max((d for _, d, _ in run["depth"]), default=0),
+        "mean_depth": statistics.mean([d for _, d, _ in run["depth"]] or [0]),
+    }
+
+def saturation_point(rows: list) -> int:
+    """
+    First concurrency level that stops paying off: throughput grows by
+    less than 10% over the previous level, or p90 latency doubles
+    compared with the lowest level. None if it never saturates.
+    """
+    for prev, cur in zip(rows, rows[1:]):
+        if cur["per_min"] < prev["per_min"] * 1.1 or cur["p90"] > rows[0]["p90"] * 2:
+            return cur["concurrency"]
+    return None
+
+def cleanup(job_ids: list):
+    # Fonts written by make_font for this run
+    out_dir = os.path.join(REPO_DIR, "backend", "app", "generated")
+    for job_id in job_ids:
+        path = os.path.join(out_dir, f"{job_id}.otf")
+        if os.path.exists(path):
+            os.remove(path)
+
+def parse_levels(value: str) -> list:
+    return [int(v) for v in value.split(",") if v]
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=parse_levels, default=[1, 2, 4], help="worker counts, comma separated")
+    parser.add_argument("--concurrency", type=parse_levels, default=[1, 2, 4, 8], help="virtual users, comma separated")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of submissions per run")
+    parser.add_argument("--scans", type=int, default=4, help="distinct synthetic scans to rotate through")
+    parser.add_argument("--job-timeout", type=float, default=120, help="seconds before a job counts as failed")
+    parser.add_argument("--interval", type=float, default=0.5, help="queue depth sampling interval (s)")
+    parser.add_argument("--json", help="also write every run (including queue depth series) here")
+    parser.add_argument("--verbose", action="store_true", help="show worker output")
+    args = parser.parse_args()
+
+    # main.py resolves its download dir relative to the working directory
+    os.chdir(REPO_DIR)
+    authkey = os.urandom(16)
+    manager = StatusManager(authkey=authkey)
+    manager.start()
+    redis = SharedRedis(manager.address, authkey)
+    celery_module._redis = redis
+    configure_celery()
+    scans = [make_scan(seed=i) for i in range(args.scans)]
+    port = free_port()
+    server = start_api(port)
+    base = f"127.0.0.1:{port}"
+
+    report = []
+    print(f"{'workers':>7} {'users':>5} {'jobs':>5} {'failed':>6} {'jobs/min':>9} {'p50':>7} {'p90':>7} {'p99':>7} {'upload':>7} {'max q':>6} {'mean q':>6}")
+    for n_workers in args.workers:
+        rows = []
+        for concurrency in args.concurrency:
+            # The pipeline prints per-glyph progress; keep the table readable.
+            # Pool processes are forked inside the redirect and inherit it
+            out = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with out, celery_workers(n_workers):
+                run = asyncio.run(drive(base, redis, scans, concurrency, args.duration, args.job_timeout, args.interval))
+            cleanup(run["job_ids"])
+
+            row = dict(summarize(run), workers=n_workers, concurrency=concurrency)
+            rows.append(row)
+            report.append(dict(row, depth=run["depth"]))
+            print(f"{n_workers:>7} {concurrency:>5} {row['jobs']:>5} {row['failed']:>6} {row['per_min']:>9.1f} "
+                  f"{row['p50']:>6.2f}s {row['p90']:>6.2f}s {row['p99']:>6.2f}s {row['upload_p50'] * 1000:>5.0f}ms "
+                  f"{row['max_depth']:>6} {row['mean_depth']:>6.1f}")
+        point = saturation_point(rows)
+        best = max(rows, key=lambda r: r["per_min"])
+        print(f"  -> {n_workers} worker(s): peak {best['per_min']:.1f} jobs/min at {best['concurrency']} users; "
+              + (f"saturates at {point} users" if point else "not saturated at the levels tried"))
+
+    server.should_exit = True
+    manager.shutdown()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time per entrypoint and first-job latency
+with and without the worker warm-up.
+
+Run from the repo root:
+    python backend/benchmarks/startup.py [--repeat 5]
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each process type imports at load time
+IMPORT_TARGETS = {
+    "api": "app.main",
+    "tracing": "app.services.tracing",
+    "fontbuild": "app.services.fontbuild",
+    "warmup": "app.services.warmup",
+}
+
+def synthetic_scan() -> bytes:
+    import cv2
+    import numpy as np
+    
+    # Same shape as test_tracing: a blank page with one 'A' in the first cell
+    img = np.ones((2000, 2000), dtype=np.uint8) * 255
+    cx, cy = (2000 // 9) // 2, (2000 // 7) // 2
+    cv2.putText(img, "A", (cx - 50, cy + 50), cv2.FONT_HERSHEY_SIMPLEX, 5, (0), 10)
+    _, buf = cv2.imencode(".png", img)
+    return buf.tobytes()
+
+def run_job(img_bytes: bytes) -> float:
+    from app.services import tracing, fontbuild
+    
+    start = time.perf_counter()
+    svg_map = tracing.extract_glyphs(img_bytes)
+    fontbuild.assemble_font(svg_map, "bench").save(io.BytesIO())
+    return time.perf_counter() - start
+
+def child(mode: str):
+    # Executed in a fresh interpreter so nothing is cached yet
+    sys.path.insert(0, BACKEND_DIR)
+    if mode.startswith("import:"):
+        start = time.perf_counter()
+        __import__(mode.split(":", 1)[1])
+        print(json.dumps({"import": time.perf_counter() - start}))
+        return
+    
+    out = {}
+    if mode == "warm":
+        from app.services import warmup
+        start = time.perf_counter()
+        warmup.warm_up()
+        out["warm_up"] = time.perf_counter() - start
+    img_bytes = synthetic_scan()
+    out["first_job"] = run_job(img_bytes)
+    out["second_job"] = run_job(img_bytes)
+    print(json.dumps(out))
+
+def spawn(mode: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode],
+        check=True, capture_output=True, text=True,
+    )
+    # Services print progress; the result is the last line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def median_ms(samples: list) -> str:
+    return f"{statistics.median(samples) * 1000:8.1f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.child)
+        return
+    
+    print("Import time (fresh interpreter, median):")
+    for label, module in IMPORT_TARGETS.items():
+        samples = [spawn(f"import:{module}")["import"] for _ in range(args.repeat)]
+        print(f"  {label:<10} {module:<28} {median_ms(samples)}")
+    
+    print("First-job latency (median):")
+    for mode in ("cold", "warm"):
+        runs = [spawn(mode) for _ in range(args.repeat)]
+        for key in runs[0]:
+            print(f"  {mode:<5} {key:<12} {median_ms([r[key] for r in runs])}")
+
+if __name__ == "__main__":
+    main()
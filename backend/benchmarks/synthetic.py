@@ -0,0 +1,59 @@
+"""Synthetic template scans with known grid geometry, shared by the benchmarks."""
+import cv2
+import numpy as np
+
+CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+def make_page(height: int, width: int, grid_box: tuple, rows: int = 7, cols: int = 9,
+              jitter: int = 0, fill: int = len(CHARS), seed: int = 0) -> dict:
+    """
+    Draw a filled-in grid on white paper (0=black ink, 255=white paper).
+
+    grid_box is (x, y, w, h) of the grid on the page; jitter moves every
+    line independently by up to that many px, like a badly drawn template
+    or a slightly wrong warp. Returns the image, the true line positions
+    and per-layer masks (ink=255) so benchmarks can score against them:
+    "lines" for the grid, "glyphs" labelled with cell index + 1.
+    """
+    rng = np.random.default_rng(seed)
+    x0, y0, gw, gh = grid_box
+    xs = np.round(x0 + np.arange(cols + 1) * gw / cols).astype(int)
+    ys = np.round(y0 + np.arange(rows + 1) * gh / rows).astype(int)
+    if jitter:
+        xs += rng.integers(-jitter, jitter + 1, cols + 1)
+        ys += rng.integers(-jitter, jitter + 1, rows + 1)
+
+    lines = np.zeros((height, width), dtype=np.uint8)
+    for x in xs:
+        cv2.line(lines, (int(x), int(ys[0])), (int(x), int(ys[-1])), 255, 3)
+    for y in ys:
+        cv2.line(lines, (int(xs[0]), int(y)), (int(xs[-1]), int(y)), 255, 3)
+
+    # Glyphs: one per cell, placed loosely around the centre like real handwriting
+    glyphs = np.zeros((height, width), dtype=np.uint8)
+    for i, char in enumerate(CHARS[:min(fill, rows * cols)]):
+        r, c = divmod(i, cols)
+        cell_w = xs[c + 1] - xs[c]
+        cell_h = ys[r + 1] - ys[r]
+        scale = 0.011 * min(cell_w, cell_h)
+        (tw, th), base = cv2.getTextSize(char, cv2.FONT_HERSHEY_SIMPLEX, scale, 8)
+        ox = int(xs[c] + (cell_w - tw) / 2 + rng.integers(-cell_w // 12, cell_w // 12 + 1))
+        oy = int(ys[r] + (cell_h + th) / 2 + rng.integers(-cell_h // 12, cell_h // 12 + 1))
+        mask = np.zeros_like(glyphs)
+        cv2.putText(mask, char, (ox, oy), cv2.FONT_HERSHEY_SIMPLEX, scale, 255, 8)
+        glyphs[mask > 0] = i + 1
+
+    img = np.full((height, width), 255, dtype=np.uint8)
+    img[(lines > 0) | (glyphs > 0)] = 0
+    return {"img": img, "xs": xs, "ys": ys, "lines": lines, "glyphs": glyphs}
+
+def make_scan(seed: int = 0, rotation: float = 0.0) -> bytes:
+    # Full 300 DPI Letter page with margins, PNG-encoded like an upload
+    page = make_page(3300, 2550, (150, 600, 2250, 1650), seed=seed)
+    img = page["img"]
+    if rotation:
+        center = (img.shape[1] // 2, img.shape[0] // 2)
+        M = cv2.getRotationMatrix2D(center, rotation, 1.0)
+        img = cv2.warpAffine(img, M, (img.shape[1], img.shape[0]), borderValue=255)
+    _, buf = cv2.imencode(".png", img)
+    return buf.tobytes()
@@ -0,0 +1,71 @@
+import sys
+import os
+import cv2
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services.tracing import locate_cells, grid_edges, offset_path
+
+def create_binary_page(h, w, x0, y0, cell_w, cell_h, rows=7, cols=9):
+    # Binarized page (ink=255) with a grid that does not fill the page
+    binary = np.zeros((h, w), dtype=np.uint8)
+    xs = x0 + np.arange(cols + 1) * cell_w
+    ys = y0 + np.arange(rows + 1) * cell_h
+    for x in xs:
+        cv2.line(binary, (int(x), int(ys[0])), (int(x), int(ys[-1])), 255, 3)
+    for y in ys:
+        cv2.line(binary, (int(xs[0]), int(y)), (int(xs[-1]), int(y)), 255, 3)
+    cv2.putText(binary, "A", (int(xs[0]) + 60, int(ys[0]) + 170), cv2.FONT_HERSHEY_SIMPLEX, 4, 255, 10)
+    return binary, xs, ys
+
+def test_unwarped_page():
+    # Fallback path: the whole scan with margins, grid in the middle
+    binary, xs, ys = create_binary_page(3300, 2550, 150, 600, 250, 235)
+    found_xs, found_ys = locate_cells(binary, 7, 9)
+    assert np.abs(found_xs - xs).max() <= 2
+    assert np.abs(found_ys - ys).max() <= 2
+
+def test_shifted_grid():
+    # Warp error: grid slightly off and smaller than the warped image
+    binary, xs, ys = create_binary_page(1750, 2250, 14, 10, 244, 245)
+    found_xs, found_ys = locate_cells(binary, 7, 9)
+    assert np.abs(found_xs - xs).max() <= 2
+    assert np.abs(found_ys - ys).max() <= 2
+
+def test_small_grid():
+    # A 3x5 grid on a Letter page: the pitch must not become a multiple of the cells
+    binary, xs, ys = create_binary_page(3300, 2550, 525, 900, 300, 236, rows=3, cols=5)
+    found_xs, found_ys = locate_cells(binary, 3, 5)
+    assert np.abs(found_xs - xs).max() <= 2
+    assert np.abs(found_ys - ys).max() <= 2
+
+def test_high_dpi_page():
+    # 1200 DPI Letter scan: the search must not grow with the page size
+    binary, xs, ys = create_binary_page(13200, 10200, 600, 2400, 1000, 942)
+    found_xs, found_ys = locate_cells(binary, 7, 9)
+    assert np.abs(found_xs - xs).max() <= 2
+    assert np.abs(found_ys - ys).max() <= 2
+
+def test_no_grid_lines():
+    # Nothing to lock on to: equal division, as before
+    binary = np.zeros((2000, 2000), dtype=np.uint8)
+    cv2.putText(binary, "A", (60, 190), cv2.FONT_HERSHEY_SIMPLEX, 5, 255, 10)
+    found_xs, found_ys = locate_cells(binary, 7, 9)
+    xs, ys = grid_edges(2000, 2000, 7, 9)
+    assert np.array_equal(found_xs, xs)
+    assert np.array_equal(found_ys, ys)
+
+def test_offset_path():
+    d = offset_path("M 10 10 L 50 90 L 90 10 Z", 100, 5)
+    assert d.startswith("M110")
+
+if __name__ == "__main__":
+    test_unwarped_page()
+    test_shifted_grid()
+    test_small_grid()
+    test_high_dpi_page()
+    test_no_grid_lines()
+    test_offset_path()
+    print("SUCCESS: grid cells located")
@@ -0,0 +1,58 @@
+import sys
+import os
+import multiprocessing
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services import imagestore
+
+def read_checksum(handle, queue):
+    # Runs in a separate process: attach to the buffer instead of receiving a copy
+    with imagestore.attach(handle) as page:
+        queue.put((page.shape, int(page.sum())))
+
+def roundtrip(backend):
+    job_id = f"test_{backend}"
+    page = np.random.randint(0, 256, (175, 225), dtype=np.uint8)
+    
+    with imagestore.JobImageStore(job_id, backend=backend) as store:
+        handle = store.put("binary", page)
+        
+        # Same process
+        with imagestore.attach(handle) as view:
+            assert view.shape == page.shape
+            assert np.array_equal(view, page)
+            assert not view.flags.writeable
+        
+        # Another process
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=read_checksum, args=(handle, queue))
+        proc.start()
+        shape, checksum = queue.get(timeout=30)
+        proc.join()
+        assert shape == page.shape
+        assert checksum == int(page.sum())
+    
+    # Everything is released with the job
+    assert not os.path.exists(imagestore.job_dir(job_id))
+    if backend == "shm":
+        try:
+            imagestore.shared_memory.SharedMemory(name=handle["name"])
+        except FileNotFoundError:
+            pass
+        else:
+            assert False, "segment should be unlinked"
+
+def test_npy_store():
+    roundtrip("npy")
+
+def test_shm_store():
+    roundtrip("shm")
+
+if __name__ == "__main__":
+    test_npy_store()
+    test_shm_store()
+    print("SUCCESS: image store round-trips")
@@ -0,0 +1,156 @@
+import sys
+import os
+import cv2
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services import tracing
+from app.services.layout import DEFAULT_CHARSET
+from app.services.tracing import (
+    extract_glyphs, grid_edges, prescreen_cells, UnusableScanError
+)
+
+def create_binary_page():
+    # Binarized warped page (ink=255) with grid lines, like after thresholding
+    h, w = 1750, 2250
+    rows, cols = 7, 9
+    binary = np.zeros((h, w), dtype=np.uint8)
+    xs, ys = grid_edges(w, h, rows, cols)
+
+    for x in xs:
+        cv2.line(binary, (int(x), 0), (int(x), h - 1), 255, 3)
+    for y in ys:
+        cv2.line(binary, (0, int(y)), (w - 1, int(y)), 255, 3)
+
+    # Cell 0: a real glyph
+    cv2.putText(binary, "A", (60, 190), cv2.FONT_HERSHEY_SIMPLEX, 5, 255, 10)
+
+    # Cell 1: scanner speckle only
+    for dx, dy in [(40, 60), (120, 90), (180, 200)]:
+        binary[dy, 250 + dx] = 255
+
+    # Cell 2: an ink blot filling the cell
+    cv2.rectangle(binary, (520, 20), (730, 230), 255, -1)
+
+    # Cell 4: a full stop, a small dot
+    cv2.circle(binary, (1125, 180), 6, 255, -1)
+
+    # Cell 5: an underscore written low, close to the bottom border
+    cv2.line(binary, (1290, 228), (1460, 228), 255, 10)
+
+    # Cell 15 (row 1): nothing written, only the label of the cell above
+    # printed at its top centre
+    cv2.putText(binary, "7", (1615, 292), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+
+    return binary, xs, ys
+
+def test_prescreen():
+    binary, xs, ys = create_binary_page()
+    clean, verdicts, removed = prescreen_cells(binary, xs, ys)
+
+    assert len(verdicts) == 63
+    assert verdicts[0] == "ok"
+    assert verdicts[1] == "empty"
+    assert verdicts[2] == "blot"
+    assert verdicts[3] == "empty"
+    assert removed["speckles"] >= 3
+    assert removed["line_pixels"] > 0
+
+    # Grid lines are stripped from the cleaned page
+    assert cv2.countNonZero(clean[:, 1500:1502]) == 0
+
+def test_small_glyphs():
+    binary, xs, ys = create_binary_page()
+    # Cell 16 (row 1): an apostrophe written high, beside the label of the
+    # cell above printed at the top centre
+    cv2.putText(binary, "8", (1865, 292), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+    cv2.line(binary, (1795, 276), (1790, 290), 255, 8)
+
+    # Without knowing the characters, the dot looks like noise and the
+    # underscore like what is left of a grid line
+    _, verdicts, _ = prescreen_cells(binary, xs, ys)
+    assert verdicts[4] == "noise"
+    assert verdicts[5] == "empty"
+
+    # Cells of known small glyphs keep them
+    chars = DEFAULT_CHARSET[:4] + "._" + DEFAULT_CHARSET[6:15] + "^'" + DEFAULT_CHARSET[17:]
+    _, verdicts, _ = prescreen_cells(binary, xs, ys, chars)
+    assert verdicts[4] == "ok"
+    assert verdicts[5] == "ok"
+    assert verdicts[16] == "ok"
+    assert verdicts[1] == "empty"
+    # ...but a label alone is still not a glyph
+    assert verdicts[15] != "ok"
+
+    # trace_page applies the same rules, and the label next to the
+    # apostrophe is not traced with it
+    bitmaps = {}
+    trace_bitmap = tracing.trace_bitmap
+    def capture(bitmap):
+        bitmaps[len(bitmaps)] = bitmap
+        return "M 0 0 L 10 0 L 10 10 Z"
+    tracing.trace_bitmap = capture
+    np.random.seed(0)  # roughen_glyph adds noise
+    try:
+        glyphs = tracing.trace_page(binary, None, chars)
+    finally:
+        tracing.trace_bitmap = trace_bitmap
+    assert sorted(glyphs) == ["'", ".", "A", "_"]
+    n, _ = cv2.connectedComponents(cv2.bitwise_not(bitmaps[3]))
+    assert n - 1 == 1
+
+def test_high_marks():
+    # Marks written near the top of the cell, in a row with no label above
+    h, w = 250, 2250
+    binary = np.zeros((h, w), dtype=np.uint8)
+    xs, ys = grid_edges(w, h, 1, 9)
+    for x in xs:
+        cv2.line(binary, (int(x), 0), (int(x), h - 1), 255, 3)
+    for y in ys:
+        cv2.line(binary, (0, int(y)), (w - 1, int(y)), 255, 3)
+    for i, char in enumerate("ABC"):
+        cv2.putText(binary, char, (250 * i + 60, 190), cv2.FONT_HERSHEY_SIMPLEX, 5, 255, 10)
+    cv2.line(binary, (875, 25), (870, 38), 255, 8)                          # apostrophe
+    cv2.polylines(binary, [np.array([(1105, 38), (1125, 25), (1145, 38)])], False, 255, 6)  # caret
+    cv2.circle(binary, (1375, 180), 6, 255, -1)                             # full stop
+
+    trace_bitmap = tracing.trace_bitmap
+    tracing.trace_bitmap = lambda bitmap: "M 0 0 L 10 0 L 10 10 Z"
+    try:
+        stats = {}
+        glyphs = tracing.trace_page(binary, stats, "ABC'^.")
+    finally:
+        tracing.trace_bitmap = trace_bitmap
+    assert sorted(glyphs) == ["'", ".", "A", "B", "C", "^"]
+    assert stats["rejected"]["empty"] == 0
+
+def test_unusable_scan():
+    # An all-black page must be rejected before tracing
+    img = np.zeros((2000, 2000), dtype=np.uint8)
+    _, buf = cv2.imencode(".png", img)
+    stats = {}
+    try:
+        extract_glyphs(buf.tobytes(), stats=stats)
+    except UnusableScanError:
+        return
+    assert False, "expected UnusableScanError"
+
+def test_tiny_scan():
+    # A page smaller than the grid has cells of a few pixels at most
+    img = np.full((5, 5), 255, dtype=np.uint8)
+    _, buf = cv2.imencode(".png", img)
+    try:
+        extract_glyphs(buf.tobytes())
+    except UnusableScanError:
+        return
+    assert False, "expected UnusableScanError"
+
+if __name__ == "__main__":
+    test_prescreen()
+    test_small_glyphs()
+    test_high_marks()
+    test_unusable_scan()
+    test_tiny_scan()
+    print("SUCCESS: prescreen checks passed")
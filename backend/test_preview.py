@@ -0,0 +1,52 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services.fontbuild import make_font
+from app.services import preview
+
+def test_preview():
+    # Square with a square hole, so the fill rule is exercised too
+    svg_map = {
+        "A": "M 100 0 L 500 0 L 500 400 L 100 400 Z M 200 100 L 200 300 L 400 300 L 400 100 Z"
+    }
+    job_id = "test_preview"
+    make_font(svg_map, job_id)
+    
+    try:
+        png, media_type, etag = preview.get_preview(job_id, "AA", "png", 32)
+        assert media_type == "image/png"
+        assert png.startswith(b"\x89PNG")
+        
+        # Second request is served from the cache
+        again = preview.get_preview(job_id, "AA", "png", 32)
+        assert again[0] is png
+        assert again[2] == etag
+        
+        svg, media_type, _ = preview.get_preview(job_id, "AA", "svg", 32)
+        assert media_type == "image/svg+xml"
+        assert svg.count(b"<path") == 2
+        
+        # Text that cannot go into an SVG is rejected, not rendered and cached
+        for bad in ("A\x00A", "A\x1bA", "\ufffe"):
+            try:
+                preview.get_preview(job_id, bad, "svg", 32)
+            except ValueError:
+                continue
+            assert False, f"expected ValueError for {bad!r}"
+        
+        # Unknown jobs and path tricks are both "not found"
+        for bad in ("missing_job", "../main"):
+            try:
+                preview.get_preview(bad)
+            except preview.PreviewNotFound:
+                continue
+            assert False, f"expected PreviewNotFound for {bad}"
+    finally:
+        os.remove(preview.font_path(job_id))
+
+if __name__ == "__main__":
+    test_preview()
+    print("SUCCESS: preview rendered")
@@ -0,0 +1,156 @@
+import sys
+import os
+import re
+import zlib
+import base64
+import cv2
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services import template, tracing
+from app.services.layout import DEFAULT_CELL_HEIGHT, DEFAULT_CELL_WIDTH, grid_rows
+
+def scan_template(pdf, fill, dpi=300):
+    """
+    "Print" a template and fill it in: replays the PDF's drawing operators
+    (cell rectangles and text) onto a white page at `dpi`, then writes each
+    character of `fill` into its cell. No PDF renderer needed, the template
+    is only lines and text. Returns PNG bytes, like an upload.
+    """
+    page_w, page_h = [float(v) for v in re.search(rb"/MediaBox \[ 0 0 ([\d.]+) ([\d.]+) \]", pdf).groups()]
+    stream = re.search(rb"stream\r?\n(.*?)~>", pdf, re.S).group(1)
+    ops = zlib.decompress(base64.a85decode(stream)).decode("latin-1")
+    scale = dpi / 72
+    img = np.full((round(page_h * scale), round(page_w * scale)), 255, dtype=np.uint8)
+    
+    cells, size, gray = [], 12, 0
+    for line in ops.splitlines():
+        m = re.search(r"/F\d+ ([\d.]+) Tf", line)
+        if m:
+            size = float(m.group(1))
+        m = re.match(r"([\d.]+) [\d.]+ [\d.]+ rg", line)
+        if m:
+            gray = int(float(m.group(1)) * 255)
+        m = re.search(r"([\d.]+) ([\d.]+) ([\d.]+) ([\d.]+) re S", line)
+        if m:
+            x, y, w, h = (float(v) * scale for v in m.groups())
+            # PDF y is up from the bottom of the page
+            x0, y0, x1, y1 = round(x), round(img.shape[0] - y - h), round(x + w), round(img.shape[0] - y)
+            cv2.rectangle(img, (x0, y0), (x1, y1), 0, 2)
+            cells.append((x0, y0, x1, y1))
+        m = re.search(r"1 0 0 1 ([\d.]+) ([\d.]+) Tm \((.*)\) Tj", line)
+        if m:
+            font_scale = 0.7 * size * scale / 22  # Hershey caps are ~22px at scale 1
+            org = (round(float(m.group(1)) * scale), round(img.shape[0] - float(m.group(2)) * scale))
+            cv2.putText(img, m.group(3), org, cv2.FONT_HERSHEY_SIMPLEX, font_scale, gray, max(1, round(font_scale)))
+    
+    # Handwriting: about half the cell tall, centred, dark pen
+    for char, (x0, y0, x1, y1) in fill.items():
+        font_scale = 0.5 * min(x1 - x0, y1 - y0) / 22
+        (tw, th), _ = cv2.getTextSize(char, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 8)
+        org = ((x0 + x1 - tw) // 2, (y0 + y1 + th) // 2)
+        cv2.putText(img, char, org, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 0, 8)
+    return img, cells
+
+def fill_cells(pdf, charset, written):
+    # Cells come out of the PDF in drawing order, i.e. row by row
+    _, cells = scan_template(pdf, {})
+    img, _ = scan_template(pdf, {char: cells[charset.index(char)] for char in written})
+    _, buf = cv2.imencode(".png", img)
+    return buf.tobytes()
+
+def test_default_template():
+    pdf, etag = template.get_template()
+    assert pdf.startswith(b"%PDF")
+    
+    # Memoized: same bytes and ETag, no second render
+    again, again_etag = template.get_template()
+    assert again is pdf
+    assert again_etag == etag
+    
+    # Rendering is deterministic, so the ETag holds across processes
+    assert template.render_template() == pdf
+
+def test_template_variants():
+    default_pdf, default_etag = template.get_template()
+    pdf, etag = template.get_template(charset="0123456789+-=", cols=5, paper="a4", dpi=600)
+    assert pdf.startswith(b"%PDF")
+    assert etag != default_etag
+
+def test_template_round_trip():
+    # A filled-in custom template reads back with every character in its own cell,
+    # including grids whose last row is only partly used and non-default cells
+    variants = [
+        ({"charset": "0123456789+-=", "cols": 5, "paper": "a4"}, "36+="),
+        ({"paper": "legal"}, "AkZ9"),
+        ({"charset": "ABCDEFGHIJ", "cols": 4, "cell_width": 0.5, "cell_height": 1.5}, "BGJ"),
+    ]
+    trace_bitmap = tracing.trace_bitmap
+    # potrace is not needed to check which cell became which character
+    tracing.trace_bitmap = lambda bitmap: "M 0 0 L 10 0 L 10 10 Z"
+    try:
+        for params, written in variants:
+            charset = params.get("charset", template.DEFAULT_CHARSET)
+            cols = params.get("cols", template.DEFAULT_COLS)
+            aspect = params.get("cell_width", DEFAULT_CELL_WIDTH) / params.get("cell_height", DEFAULT_CELL_HEIGHT)
+            pdf, _ = template.get_template(**params)
+            
+            # The whole rows x cols grid is drawn, not just the used cells
+            _, cells = scan_template(pdf, {})
+            assert len(cells) == grid_rows(charset, cols) * cols
+            
+            scan = fill_cells(pdf, charset, written)
+            rows = grid_rows(charset, cols)
+            _, binary = tracing.prepare_page(scan, rows, cols, aspect)
+            # The grid's outer rectangle was found and warped, not the raw page,
+            # with cells keeping their aspect
+            assert binary.shape == (rows * 250, cols * round(250 * aspect))
+            glyphs = tracing.trace_page(binary, None, charset, cols)
+            assert sorted(glyphs) == sorted(written), (params, sorted(glyphs))
+    finally:
+        tracing.trace_bitmap = trace_bitmap
+
+def test_labels_not_traced():
+    # Each label is printed under its cell, i.e. at the top of the cell below:
+    # glyphs in rows 1+ must reach potrace without it
+    pdf, _ = template.get_template()
+    charset = template.DEFAULT_CHARSET
+    scan = fill_cells(pdf, charset, "AJkz")  # 'A' in row 0, the rest below
+    _, binary = tracing.prepare_page(scan, grid_rows(charset, template.DEFAULT_COLS), template.DEFAULT_COLS)
+    
+    bitmaps = {}
+    trace_bitmap = tracing.trace_bitmap
+    def capture(bitmap):
+        bitmaps[len(bitmaps)] = bitmap
+        return "M 0 0 L 10 0 L 10 10 Z"
+    tracing.trace_bitmap = capture
+    np.random.seed(0)  # roughen_glyph adds noise
+    try:
+        glyphs = tracing.trace_page(binary, None, charset)
+    finally:
+        tracing.trace_bitmap = trace_bitmap
+    
+    assert sorted(glyphs) == sorted("AJkz")
+    for bitmap in bitmaps.values():
+        # Potrace input is black ink on white
+        n, _ = cv2.connectedComponents(cv2.bitwise_not(bitmap))
+        assert n - 1 == 1
+
+def test_invalid_template():
+    for params in ({"charset": "AA"}, {"cols": 0}, {"paper": "tabloid"},
+                   {"cell_width": 1.9, "cols": 12}, {"cell_height": 0.2}):
+        try:
+            template.get_template(**params)
+        except ValueError:
+            continue
+        assert False, f"expected ValueError for {params}"
+
+if __name__ == "__main__":
+    test_default_template()
+    test_template_variants()
+    test_template_round_trip()
+    test_labels_not_traced()
+    test_invalid_template()
+    print("SUCCESS: templates rendered")
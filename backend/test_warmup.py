@@ -0,0 +1,33 @@
+import sys
+import os
+import subprocess
+
+# Add backend to path
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services.warmup import PRELOAD_MODULES, warm_up
+
+def test_warm_up():
+    timings = warm_up()
+    
+    # Every stage ran and reported a duration
+    for key in ("imports", "font_builder", "synthetic_job"):
+        assert key in timings
+        assert timings[key] >= 0
+    
+    # The lazily imported modules are now loaded
+    for name in PRELOAD_MODULES:
+        assert name in sys.modules
+
+def test_preload_is_lazy():
+    # Preloading only pays off for modules the worker does not import at load
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = ("import sys, backend.worker; "
+            f"print(','.join(m for m in {PRELOAD_MODULES!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=repo_dir, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+if __name__ == "__main__":
+    test_warm_up()
+    test_preload_is_lazy()
+    print("SUCCESS: worker warm-up ran")
@@ -1,12 +1,38 @@
-from .app.celery_app import celery_app
-from .app.services import tracing, fontbuild
-import redis, json
+from .app.celery_app import celery_app, get_redis
+from .app.services import tracing, fontbuild, imagestore, layout, warmup
+from celery.signals import worker_process_init
+import json
+import time
+
+@worker_process_init.connect
+def warm_up_process(**kwargs):
+    # Runs once in every pool process, before it accepts jobs
+    timings = warmup.warm_up()
+    print("Worker warm-up: " + ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in timings.items()))
 
 @celery_app.task(name="tasks.build_font")
-def build_font(job_id: str, img_bytes: bytes):
-    redis_client = redis.Redis(host="redis", port=6379)
+def build_font(job_id: str, img_bytes: bytes, charset: str = layout.DEFAULT_CHARSET, cols: int = layout.DEFAULT_COLS,
+               cell_width: float = layout.DEFAULT_CELL_WIDTH, cell_height: float = layout.DEFAULT_CELL_HEIGHT):
+    redis_client = get_redis()
+    # Terminal states carry a "finished" timestamp (epoch seconds), so clients
+    # can measure completion without depending on how often they poll
     redis_client.hset("jobs", job_id, json.dumps({"state":"TRACING"}))
-    svg_map = tracing.extract_glyphs(img_bytes)
-    redis_client.hset("jobs", job_id, json.dumps({"state":"BUILDING"}))
-    otf_path = fontbuild.make_font(svg_map, job_id)
-    redis_client.hset("jobs", job_id, json.dumps({"state":"DONE", "path": otf_path}))
+    prescreen = {}
+    # The binarized page is handed to the tracing stage through the job's
+    # image store (attach, don't copy); the warped grayscale page has no consumer
+    # after binarization, so it is dropped instead of stored.
+    # Buffers are released when the job finishes
+    with imagestore.JobImageStore(job_id) as store:
+        warped, binary = tracing.prepare_page(img_bytes, layout.grid_rows(charset, cols), cols,
+                                              cell_width / cell_height)
+        handle = store.put("binary", binary)
+        del warped, binary
+        try:
+            with imagestore.attach(handle) as page:
+                svg_map = tracing.trace_page(page, prescreen, charset, cols)
+        except tracing.UnusableScanError as e:
+            redis_client.hset("jobs", job_id, json.dumps({"state":"FAILED", "error": str(e), "prescreen": prescreen, "finished": time.time()}))
+            return
+        redis_client.hset("jobs", job_id, json.dumps({"state":"BUILDING", "prescreen": prescreen}))
+        otf_path = fontbuild.make_font(svg_map, job_id)
+    redis_client.hset("jobs", job_id, json.dumps({"state":"DONE", "path": otf_path, "prescreen": prescreen, "finished": time.time()}))
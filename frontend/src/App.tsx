@@ -3,6 +3,7 @@ import { useState } from 'react';
 export default function App() {
   const [jobId, setJobId] = useState<string>();
   const [progress, setProgress] = useState<string>();
+  const [error, setError] = useState<string>();
 
   const handleUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0];
@@ -16,6 +17,7 @@ export default function App() {
       const { job_id } = await res.json();
       setJobId(job_id);
       setProgress("QUEUED");
+      setError(undefined);
 
       // WebSocket connection - connect directly to API port 8000
       // (Vite proxy doesn't handle WebSocket upgrades well)
@@ -25,6 +27,9 @@ export default function App() {
       ws.onmessage = (ev) => {
         const data = JSON.parse(ev.data);
         setProgress(data.state);
+        if (data.state === "FAILED") {
+          setError(data.error);
+        }
         if (data.state === "DONE") {
           // Provide a link instead of auto-opening which might be blocked
           // But for now, let's try auto-open and show link
@@ -57,9 +62,15 @@ export default function App() {
         <div className="status">
           {jobId && <p>Job ID: <small>{jobId}</small></p>}
           <p>Status: <strong>{progress}</strong></p>
+          {progress === "FAILED" && error && <p>{error}</p>}
           {progress === "DONE" && (
             <div>
               <p>Font generated!</p>
+              <img
+                className="preview"
+                src={`/api/preview/${jobId}?text=${encodeURIComponent("ABCDEFGHIJKLM\nabcdefghijklm\n0123456789")}`}
+                alt="Font preview"
+              />
               <a href={`/api/download/${jobId}.otf`} target="_blank" className="btn primary">Download Font</a>
             </div>
           )}
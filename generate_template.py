@@ -1,79 +1,37 @@
 #!/usr/bin/env python3
-"""Generate a handwriting template PDF with a 7x9 grid."""
+"""Generate a handwriting template PDF (default: 7x9 grid, Letter paper).
 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
+The API renders templates on demand from the same code; this script is
+for printing one offline.
+"""
 
-def create_template(filename):
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
-    
-    # Title
-    c.setFont("Helvetica-Bold", 20)
-    c.drawCentredString(width/2, height - 0.5*inch, "Handwriting Font Template")
-    
-    # Instructions
-    c.setFont("Helvetica", 10)
-    instructions = [
-        "Instructions:",
-        "1. Print this template",
-        "2. Write each character clearly in its box using a dark pen",
-        "3. Scan the completed template at 300 DPI or higher",
-        "4. Upload the scan to generate your custom font"
-    ]
-    y = height - inch
-    for line in instructions:
-        c.drawString(0.5*inch, y, line)
-        y -= 0.15*inch
-    
-    # Grid parameters
-    rows = 7
-    cols = 9
-    chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-    
-    # Calculate cell size
-    grid_width = 7.5 * inch
-    grid_height = 5.5 * inch
-    cell_width = grid_width / cols
-    cell_height = grid_height / rows
-    
-    # Starting position (centered)
-    start_x = (width - grid_width) / 2
-    start_y = height - 3*inch
-    
-    # Draw grid
-    c.setLineWidth(0.5)
-    c.setStrokeColorRGB(0, 0, 0)
-    
-    char_index = 0
-    for row in range(rows):
-        for col in range(cols):
-            if char_index >= len(chars):
-                break
-                
-            x = start_x + col * cell_width
-            y = start_y - row * cell_height
-            
-            # Draw cell border
-            c.rect(x, y - cell_height, cell_width, cell_height)
-            
-            # Draw character label (small, centered below)
-            c.setFont("Helvetica", 8)
-            c.setFillColorRGB(0.5, 0.5, 0.5)
-            # y - cell_height is the bottom of the box
-            # Draw slightly below that
-            c.drawCentredString(x + cell_width/2, y - cell_height - 10, chars[char_index])
-            
-            char_index += 1
-    
-    # Footer
-    c.setFont("Helvetica", 8)
-    c.setFillColorRGB(0.3, 0.3, 0.3)
-    c.drawCentredString(width/2, 0.5*inch, "Write each character in the center of its box")
-    
-    c.save()
+import argparse
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.services.template import (
+    DEFAULT_CELL_HEIGHT, DEFAULT_CELL_WIDTH, DEFAULT_CHARSET, DEFAULT_COLS,
+    PAPER_SIZES, render_template
+)
+
+def create_template(filename, **params):
+    with open(filename, "wb") as f:
+        f.write(render_template(**params))
     print(f"Template created: {filename}")
 
 if __name__ == "__main__":
-    create_template("backend/app/assets/template.pdf")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", nargs="?", default="template.pdf")
+    parser.add_argument("--charset", default=DEFAULT_CHARSET)
+    parser.add_argument("--cols", type=int, default=DEFAULT_COLS)
+    parser.add_argument("--cell-width", type=float, default=DEFAULT_CELL_WIDTH, help="inches")
+    parser.add_argument("--cell-height", type=float, default=DEFAULT_CELL_HEIGHT, help="inches")
+    parser.add_argument("--paper", choices=sorted(PAPER_SIZES), default="letter")
+    parser.add_argument("--dpi", type=int, default=300, help="scan resolution printed in the instructions")
+    args = parser.parse_args()
+    create_template(args.output, charset=args.charset, cols=args.cols,
+                    cell_width=args.cell_width, cell_height=args.cell_height,
+                    paper=args.paper, dpi=args.dpi)